@@ -6,9 +6,15 @@ directories/files to ignore during prompt generation and default file type filte
 Attributes:
     DEFAULT_IGNORE_DIRS (List[str]): List of directory names to ignore.
     DEFAULT_FILE_TYPES (List[str]): Default list of file extensions to process.
+    DEFAULT_SKIP_FILES (List[str]): Glob patterns for lockfiles, minified bundles
+        and other generated files that are rarely useful in a prompt. They are
+        offered next to DEFAULT_IGNORE_DIRS in the ignore settings.
+    IGNORE_FROZEN (FrozenSet[str]): DEFAULT_IGNORE_DIRS and DEFAULT_SKIP_FILES
+        as a frozenset, the default ignore options of ZipReader.members.
+    MAX_FILE_BYTES (int): Files larger than this many bytes are skipped.
 """
 
-from typing import List
+from typing import FrozenSet, List
 
 DEFAULT_IGNORE_DIRS: List[str] = [
     "node_modules",
@@ -42,3 +48,20 @@ DEFAULT_FILE_TYPES: List[str] = [
     ".rb",
     ".php",
 ]
+
+DEFAULT_SKIP_FILES: List[str] = [
+    "package-lock.json",
+    "yarn.lock",
+    "pnpm-lock.yaml",
+    "composer.lock",
+    "Gemfile.lock",
+    "poetry.lock",
+    "Pipfile.lock",
+    "*.min.js",
+    "*.min.css",
+    "*.map",
+]
+
+IGNORE_FROZEN: FrozenSet[str] = frozenset(DEFAULT_IGNORE_DIRS + DEFAULT_SKIP_FILES)
+
+MAX_FILE_BYTES: int = 1 << 20
@@ -1,88 +1,184 @@
-"""Module for processing ZIP files and retrieving file paths.
+"""Module for reading files from ZIP archives.
 
-This module provides functions to extract ZIP files into a temporary
-directory and retrieve all file paths recursively while ignoring
-specified directories, optionally filtering by file types.
+This module provides a ZipReader that lists the members of a ZIP file,
+skipping ignored directories and file names and optionally filtering by
+file types, and reads and decodes members directly from the archive
+without extracting them.
 """
 
-import os
+import re
 import zipfile
-import tempfile
-import shutil
-from typing import List, Set, Optional
+from fnmatch import translate
+from functools import lru_cache
+from typing import Any, Callable, FrozenSet, Iterator, List, Set, Optional, Tuple
 
-from config import DEFAULT_IGNORE_DIRS
-from exceptions import FileProcessingError, TempFileError
+from config import IGNORE_FROZEN, MAX_FILE_BYTES
+from exceptions import FileProcessingError
+from utils import file_ext
 
+_SNIFF_BYTES: int = 8192
 
-def extract_zip(zip_path: str) -> str:
-    """Extract the provided ZIP file into a temporary directory.
+
+@lru_cache(maxsize=32)
+def _ignored_file_matcher(ignore: FrozenSet[str]) -> Callable[[str], Any]:
+    """Compile ignore options into a single matcher for file names.
+
+    Each option is treated as an ``fnmatch`` glob, so plain names such as
+    ``yarn.lock`` match exactly and patterns such as ``*.min.js`` match
+    minified bundles. Matchers are cached per set of options.
+    """
+    return re.compile(
+        "|".join(translate(pattern) for pattern in ignore) or "(?!)"
+    ).match
+
+
+def _member_parts(
+    info: zipfile.ZipInfo, ignore_dirs: Set[str], file_types: Optional[Set[str]]
+) -> Optional[List[str]]:
+    """Return the sanitized path components of a ZIP member, or None to skip it.
+
+    Directory entries, members inside ignored directories and files whose
+    extension is not in ``file_types`` are skipped. Empty, ``.`` and ``..``
+    components are dropped so that relative paths stay inside the archive.
+    """
+    if info.is_dir():
+        return None
+    parts: List[str] = [p for p in info.filename.split("/") if p not in ("", ".", "..")]
+    if not parts or any(part in ignore_dirs for part in parts[:-1]):
+        return None
+    if file_types and file_ext(parts[-1]) not in file_types:
+        return None
+    return parts
+
+
+class ZipReader:
+    """Read the members of a ZIP file from any number of threads.
+
+    A single ZipFile handle is opened up front and shared by every thread.
+    ZipFile reads member data through a shared file object that seeks and
+    reads under a lock, so concurrent ``open`` calls are safe, and the central
+    directory is parsed only once. zlib releases the GIL while inflating, so
+    members read on different threads still decompress in parallel. Use as a
+    context manager to close the handle afterwards.
 
     Args:
         zip_path (str): The path to the ZIP file.
 
-    Returns:
-        str: The path to the temporary directory containing the extracted files.
-
     Raises:
-        TempFileError: If there's an error creating or accessing the temporary directory.
-        FileProcessingError: If the ZIP file is invalid or corrupted.
+        FileProcessingError: If the ZIP file is invalid, corrupted or unreadable.
     """
-    try:
-        temp_dir: str = tempfile.mkdtemp()
-    except OSError as e:
-        raise TempFileError(f"Failed to create temporary directory: {e}") from e
-
-    try:
-        with zipfile.ZipFile(zip_path, "r") as zip_ref:
-            zip_ref.extractall(temp_dir)
-    except zipfile.BadZipFile as e:
-        shutil.rmtree(temp_dir, ignore_errors=True)
-        raise FileProcessingError(f"Invalid or corrupted ZIP file: {e}") from e
-    except OSError as e:
-        shutil.rmtree(temp_dir, ignore_errors=True)
-        raise TempFileError(
-            f"Failed to extract files to temporary directory: {e}"
-        ) from e
-
-    return temp_dir
-
-
-def get_files_from_directory(
-    base_dir: str,
-    ignore_dirs: Optional[Set[str]] = None,
-    file_types: Optional[Set[str]] = None,
-) -> List[str]:
-    """Retrieve a list of file paths from a directory, excluding ignored
-    directories and optionally filtering by file types.
+
+    def __init__(self, zip_path: str) -> None:
+        self.zip_path: str = zip_path
+        try:
+            self._zip_ref: zipfile.ZipFile = zipfile.ZipFile(zip_path, "r")
+        except zipfile.BadZipFile as e:
+            raise FileProcessingError(f"Invalid or corrupted ZIP file: {e}") from e
+        except OSError as e:
+            raise FileProcessingError(f"Failed to read ZIP file {zip_path}: {e}") from e
+
+    def __enter__(self) -> "ZipReader":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def members(
+        self,
+        ignore_dirs: Optional[Set[str]] = None,
+        file_types: Optional[Set[str]] = None,
+    ) -> Iterator[Tuple[str, zipfile.ZipInfo, Optional[str]]]:
+        """Yield the wanted members of the archive without reading their data.
+
+        Members inside ignored directories or with a disallowed extension are
+        left out. Files whose name matches an ignore option, or that are larger
+        than MAX_FILE_BYTES, are yielded with a message saying why they are
+        skipped, so callers can report them instead of dropping them silently.
+
+        Args:
+            ignore_dirs (Optional[Set[str]]): Directory names and file name
+                patterns to skip. Defaults to IGNORE_FROZEN.
+            file_types (Optional[Set[str]]): A set of file extensions to include.
+                If None, all files are included.
+
+        Yields:
+            Tuple[str, zipfile.ZipInfo, Optional[str]]: The sanitized relative
+                path and the ZipInfo of each member, and a skip message if the
+                member should not be read, otherwise None.
+        """
+        ignore_dirs = IGNORE_FROZEN if ignore_dirs is None else frozenset(ignore_dirs)
+        is_ignored_file = _ignored_file_matcher(ignore_dirs)
+        file_types = frozenset(file_types) if file_types else None
+
+        for info in self._zip_ref.infolist():
+            parts = _member_parts(info, ignore_dirs, file_types)
+            if parts is None:
+                continue
+            rel_path: str = "/".join(parts)
+            if is_ignored_file(parts[-1]):
+                yield rel_path, info, f"Skipping ignored file: {rel_path}"
+            elif info.file_size > MAX_FILE_BYTES:
+                yield rel_path, info, (
+                    f"Skipping file larger than {MAX_FILE_BYTES} bytes: {rel_path}"
+                )
+            else:
+                yield rel_path, info, None
+
+    def read_text(self, info: zipfile.ZipInfo) -> Optional[str]:
+        """Read and decode a text member, skipping binary members early.
+
+        The first ``_SNIFF_BYTES`` are checked for a NUL byte before the rest
+        of the member is decompressed, so images, bytecode and other binaries
+        are rejected without inflating them in full. Empty members, such as
+        blank ``__init__.py`` files, are returned without being opened at all.
+
+        Args:
+            info (zipfile.ZipInfo): The member to read.
+
+        Returns:
+            Optional[str]: The decoded text, or None if the member looks binary
+                or isn't valid UTF-8.
+
+        Raises:
+            FileProcessingError: If the member is corrupted or can't be read.
+        """
+        if not info.file_size:
+            return ""
+        try:
+            with self._zip_ref.open(info) as f:
+                data: bytes = f.read(_SNIFF_BYTES)
+                if b"\0" in data:
+                    return None
+                data += f.read()
+        except zipfile.BadZipFile as e:
+            raise FileProcessingError(f"Invalid or corrupted ZIP file: {e}") from e
+        except OSError as e:
+            raise FileProcessingError(
+                f"Failed to read {info.filename} from {self.zip_path}: {e}"
+            ) from e
+        try:
+            return decode_text(data)
+        except UnicodeDecodeError:
+            return None
+
+    def close(self) -> None:
+        """Close the shared ZipFile handle."""
+        self._zip_ref.close()
+
+
+def decode_text(data: bytes) -> str:
+    """Decode UTF-8 file content, normalizing newlines to ``\\n`` as text mode does.
 
     Args:
-        base_dir (str): The base directory to search for files.
-        ignore_dirs (Optional[Set[str]]): A set of directory names to ignore.
-            Defaults to DEFAULT_IGNORE_DIRS.
-        file_types (Optional[Set[str]]): A set of file extensions to include.
-            If None, all files are included.
+        data (bytes): The raw file content.
 
     Returns:
-        List[str]: A list of file paths.
+        str: The decoded text.
 
     Raises:
-        FileProcessingError: If there's an error accessing or reading the directory.
+        UnicodeDecodeError: If the data is not valid UTF-8 (e.g., a binary file).
     """
-    if ignore_dirs is None:
-        ignore_dirs = set(DEFAULT_IGNORE_DIRS)
-
-    try:
-        files_list: List[str] = []
-        for root, dirs, files in os.walk(base_dir):
-            dirs[:] = [d for d in dirs if d not in ignore_dirs]
-            for file in files:
-                if file_types:
-                    ext: str = os.path.splitext(file)[1].lower()
-                    if ext not in file_types:
-                        continue
-                file_path: str = os.path.join(root, file)
-                files_list.append(file_path)
-        return files_list
-    except OSError as e:
-        raise FileProcessingError(f"Failed to read directory {base_dir}: {e}") from e
+    content: str = data.decode("utf-8")
+    if "\r" in content:
+        content = content.replace("\r\n", "\n").replace("\r", "\n")
+    return content
@@ -4,13 +4,47 @@ This module provides functions to detect programming languages based
 on file extensions and to format file content in Plaintext, Markdown, XML,
 or JSON formats optimized for language model prompts. It supports customization options
 such as including file boundaries, truncating content, and appending file metadata.
+
+JSON output uses ``orjson`` when it is installed and falls back to the standard
+library ``json`` module otherwise.
 """
 
-import os
 import json
-from typing import Any, Dict
+from typing import Any, Callable, Dict, List, Optional
 
 from exceptions import FormatError
+from utils import file_ext
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+def _json_dumps(obj: Any) -> str:
+    """Serialize an object to indented JSON, preferring orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode("utf-8")
+    return json.dumps(obj, indent=2, ensure_ascii=False)
+
+
+_LANGUAGE_MAP: Dict[str, str] = {
+    ".py": "python",
+    ".js": "javascript",
+    ".jsx": "javascript",
+    ".ts": "typescript",
+    ".tsx": "typescript",
+    ".java": "java",
+    ".html": "html",
+    ".css": "css",
+    ".json": "json",
+    ".xml": "xml",
+    ".md": "markdown",
+    ".yml": "yaml",
+    ".yaml": "yaml",
+    ".rb": "ruby",
+    ".php": "php",
+}
 
 
 def get_language(file_name: str) -> str:
@@ -22,25 +56,214 @@ def get_language(file_name: str) -> str:
     Returns:
         str: The detected programming language, or an empty string if unknown.
     """
-    ext: str = os.path.splitext(file_name)[1].lower()
-    mapping: Dict[str, str] = {
-        ".py": "python",
-        ".js": "javascript",
-        ".jsx": "javascript",
-        ".ts": "typescript",
-        ".tsx": "typescript",
-        ".java": "java",
-        ".html": "html",
-        ".css": "css",
-        ".json": "json",
-        ".xml": "xml",
-        ".md": "markdown",
-        ".yml": "yaml",
-        ".yaml": "yaml",
-        ".rb": "ruby",
-        ".php": "php",
+    # ZIP member paths always use "/", so the basename starts after the last one.
+    return _LANGUAGE_MAP.get(file_ext(file_name[file_name.rfind("/") + 1 :]), "")
+
+
+def _metadata_suffix(file_metadata: Optional[Dict[str, Any]]) -> str:
+    """Render file metadata as a suffix for file boundary headers."""
+    if file_metadata and "size" in file_metadata:
+        return f" [Size: {file_metadata['size']} bytes]"
+    return ""
+
+
+def _format_plaintext(
+    out: List[str],
+    rel_path: str,
+    content: str,
+    language: str,  # pylint: disable=unused-argument
+    file_metadata: Optional[Dict[str, Any]],
+    include_boundaries: bool,
+) -> None:
+    """Write file content as plain text with optional file boundaries."""
+    if not include_boundaries:
+        out.append(content)
+        return
+    out.append(f"=== File: {rel_path}{_metadata_suffix(file_metadata)} ===\n")
+    out.append(content)
+    out.append(f"\n=== End of File: {rel_path} ===\n")
+
+
+def _format_markdown(
+    out: List[str],
+    rel_path: str,
+    content: str,
+    language: str,
+    file_metadata: Optional[Dict[str, Any]],
+    include_boundaries: bool,
+) -> None:
+    """Write file content as a fenced Markdown code block."""
+    if include_boundaries:
+        out.append(f"## File: {rel_path}{_metadata_suffix(file_metadata)}\n")
+    out.append(f"```{language}\n")
+    out.append(content)
+    out.append("\n```\n")
+
+
+def _format_xml(
+    out: List[str],
+    rel_path: str,
+    content: str,
+    language: str,
+    file_metadata: Optional[Dict[str, Any]],
+    include_boundaries: bool,
+) -> None:
+    """Write file content as an XML element with a CDATA body."""
+    if not include_boundaries:
+        out.append("<content><![CDATA[")
+        out.append(content)
+        out.append("]]></content>\n")
+        return
+    lang_attr: str = f' language="{language}"' if language else ""
+    out.append(
+        f'<file path="{rel_path}"{lang_attr}{_metadata_suffix(file_metadata)}>\n'
+        "  <content><![CDATA["
+    )
+    out.append(content)
+    out.append("]]></content>\n</file>\n")
+
+
+def _format_json(
+    out: List[str],
+    rel_path: str,
+    content: str,
+    language: str,
+    file_metadata: Optional[Dict[str, Any]],
+    include_boundaries: bool,  # pylint: disable=unused-argument
+) -> None:
+    """Write file content as an indented JSON object."""
+    file_obj: Dict[str, Any] = {
+        "path": rel_path,
+        "content": content,
     }
-    return mapping.get(ext, "")
+    if language:
+        file_obj["language"] = language
+    if file_metadata:
+        file_obj["metadata"] = file_metadata
+    out.append(_json_dumps(file_obj))
+
+
+FileFormatter = Callable[
+    [List[str], str, str, str, Optional[Dict[str, Any]], bool], None
+]
+
+BoundFormatter = Callable[[List[str], str, str, Optional[Dict[str, Any]]], None]
+
+_FORMATTERS: Dict[str, FileFormatter] = {
+    "Plaintext": _format_plaintext,
+    "Markdown": _format_markdown,
+    "XML": _format_xml,
+    "JSON": _format_json,
+}
+
+
+def prepare_formatter(output_format: str) -> FileFormatter:
+    """Validate an output format once and return its specialized formatter.
+
+    The returned callable takes ``(out, rel_path, content, language,
+    file_metadata, include_boundaries)``, appends the formatted fragments to
+    ``out`` and does no further validation.
+
+    Args:
+        output_format (str): The desired output format ('Plaintext', 'Markdown', 'XML', 'JSON').
+
+    Returns:
+        FileFormatter: The formatter function for the given output format.
+
+    Raises:
+        FormatError: If an unsupported format is provided.
+    """
+    try:
+        return _FORMATTERS[output_format]
+    except KeyError:
+        raise FormatError(
+            f"Unsupported format. Choose from: {', '.join(_FORMATTERS)}"
+        ) from None
+
+
+def make_formatter(
+    output_format: str, include_boundaries: bool = True, truncate_length: int = 0
+) -> BoundFormatter:
+    """Validate run-wide formatting settings once and return a per-file writer.
+
+    The output format, boundaries and truncation are fixed for a whole prompt,
+    so they are bound here instead of being re-validated for every file. The
+    returned callable takes ``(out, rel_path, content, file_metadata)`` and
+    appends the formatted fragments to ``out``.
+
+    Args:
+        output_format (str): The desired output format ('Plaintext', 'Markdown', 'XML', 'JSON').
+        include_boundaries (bool): Whether to include file header/footer boundaries.
+            Defaults to True.
+        truncate_length (int): Maximum number of characters for content
+            (0 means no truncation). Defaults to 0.
+
+    Returns:
+        BoundFormatter: The per-file formatting function.
+
+    Raises:
+        FormatError: If an unsupported format is provided.
+    """
+    formatter: FileFormatter = prepare_formatter(output_format)
+
+    def write(
+        out: List[str],
+        rel_path: str,
+        content: str,
+        file_metadata: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        if 0 < truncate_length < len(content):
+            content = f"{content[:truncate_length]}..."
+        formatter(
+            out,
+            rel_path,
+            content,
+            get_language(rel_path),
+            file_metadata,
+            include_boundaries,
+        )
+
+    return write
+
+
+def write_file_content(
+    out: List[str],
+    rel_path: str,
+    content: str,
+    output_format: str,
+    options: Dict[str, Any] = None,
+) -> None:
+    """Append the formatted content of a file to a list of output chunks.
+
+    Writing fragments into a shared list lets callers build a whole prompt with
+    a single ``"".join`` instead of first joining each file into its own string.
+    See ``format_file_content`` for the supported formats and options.
+
+    Args:
+        out (List[str]): The list of output chunks to append to.
+        rel_path (str): The relative file path.
+        content (str): The file content.
+        output_format (str): The desired output format ('Plaintext', 'Markdown', 'XML', 'JSON').
+        options (Dict[str, Any], optional): Formatting options. Defaults to None.
+
+    Raises:
+        FormatError: If an unsupported format is provided or if formatting fails.
+    """
+    try:
+        if not isinstance(rel_path, str) or not rel_path.strip():
+            raise FormatError("File path must be a non-empty string")
+        if not isinstance(content, str):
+            raise FormatError("Content must be a string")
+
+        options = options or {}
+        write = make_formatter(
+            output_format,
+            options.get("include_boundaries", True),
+            options.get("truncate_length", 0),
+        )
+        write(out, rel_path, content, options.get("file_metadata"))
+    except Exception as e:
+        raise FormatError(f"Failed to format content for {rel_path}: {str(e)}") from e
 
 
 def format_file_content(
@@ -67,78 +290,6 @@ def format_file_content(
     Raises:
         FormatError: If an unsupported format is provided or if formatting fails.
     """
-    try:
-        valid_formats = frozenset({"Plaintext", "Markdown", "XML", "JSON"})
-
-        if not isinstance(rel_path, str) or not rel_path.strip():
-            raise FormatError("File path must be a non-empty string")
-        if not isinstance(content, str):
-            raise FormatError("Content must be a string")
-        if output_format not in valid_formats:
-            raise FormatError(
-                f"Unsupported format. Choose from: {', '.join(valid_formats)}"
-            )
-
-        options = options or {}
-        truncate_length: int = options.get("truncate_length", 0)
-        include_boundaries: bool = options.get("include_boundaries", True)
-        file_metadata = options.get("file_metadata")
-
-        if 0 < truncate_length < len(content):
-            content = f"{content[:truncate_length]}..."
-
-        metadata_str = (
-            f" [Size: {file_metadata['size']} bytes]"
-            if file_metadata and "size" in file_metadata
-            else ""
-        )
-        language: str = get_language(rel_path)
-
-        match output_format:
-            case "Plaintext":
-                result = (
-                    content
-                    if not include_boundaries
-                    else (
-                        f"=== File: {rel_path}{metadata_str} ===\n"
-                        f"{content}\n"
-                        f"=== End of File: {rel_path} ===\n"
-                    )
-                )
-            case "Markdown":
-                fence: str = f"```{language}" if language else "```"
-                result = (
-                    f"{fence}\n{content}\n```\n"
-                    if not include_boundaries
-                    else (
-                        f"## File: {rel_path}{metadata_str}\n"
-                        f"{fence}\n"
-                        f"{content}\n"
-                        "```\n"
-                    )
-                )
-            case "XML":
-                lang_attr: str = f' language="{language}"' if language else ""
-                result = (
-                    f"<content><![CDATA[{content}]]></content>\n"
-                    if not include_boundaries
-                    else (
-                        f'<file path="{rel_path}"{lang_attr}{metadata_str}>\n'
-                        f"  <content><![CDATA[{content}]]></content>\n"
-                        f"</file>\n"
-                    )
-                )
-            case "JSON":
-                file_obj = {
-                    "path": rel_path,
-                    "content": content,
-                }
-                if language:
-                    file_obj["language"] = language
-                if file_metadata:
-                    file_obj["metadata"] = file_metadata
-                result = json.dumps(file_obj, indent=2)
-
-        return result
-    except Exception as e:
-        raise FormatError(f"Failed to format content for {rel_path}: {str(e)}") from e
+    out: List[str] = []
+    write_file_content(out, rel_path, content, output_format, options)
+    return "".join(out)
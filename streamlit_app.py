@@ -11,158 +11,296 @@ Usage:
 """
 
 # Standard library imports
+import hashlib
 import os
-import shutil
 import tempfile
-import zipfile
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 
 # pylint: disable=deprecated-module
-from formatter import format_file_content
+from formatter import BoundFormatter, make_formatter
+from functools import partial
 from pathlib import Path
-from typing import Any, Dict, List, Set, Tuple
+from zipfile import ZipInfo
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+)
 
 # Third-party imports
 import streamlit as st
 
 # Local application/library-specific imports
-from config import DEFAULT_IGNORE_DIRS, DEFAULT_FILE_TYPES
+from config import DEFAULT_IGNORE_DIRS, DEFAULT_FILE_TYPES, DEFAULT_SKIP_FILES
 from exceptions import FileProcessingError, FormatError, TempFileError
-from file_processor import extract_zip, get_files_from_directory
+from file_processor import ZipReader
 
+_READ_WORKERS: int = min(32, (os.cpu_count() or 1) * 4)
+_MAX_PENDING: int = _READ_WORKERS * 4
+_MAX_TEXT_AREA_CHARS: int = 1_000_000
+_PREVIEW_CHARS: int = 100_000
 
-def handle_file_upload(multi: bool = True) -> List[str]:
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def handle_file_upload(multi: bool = True) -> List[Tuple[str, str]]:
     """Handle file upload and save each file to a temporary location.
 
+    Streamlit reruns the script on every widget interaction, so uploads are
+    identified by a BLAKE2b digest of their content and the temporary file
+    saved for a digest is reused, as long as it still exists, instead of
+    writing the whole archive to disk again.
+
     Args:
         multi (bool): If True, allow multiple files.
 
     Returns:
-        List[str]: A list of paths to the temporary ZIP files.
+        List[Tuple[str, str]]: The temporary ZIP file path and content digest
+            of each uploaded file.
     """
     uploaded_files = st.file_uploader(
         "📁 Upload ZIP file(s)", type="zip", accept_multiple_files=multi
     )
-    temp_paths: List[str] = []
+    uploads: List[Tuple[str, str]] = []
     if not uploaded_files:
-        return temp_paths
+        return uploads
 
     if not isinstance(uploaded_files, list):
         uploaded_files = [uploaded_files]
 
+    saved_paths: Dict[str, str] = st.session_state.setdefault("upload_paths", {})
     for uploaded_file in uploaded_files:
-        try:
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".zip") as tmp_file:
-                tmp_file.write(uploaded_file.getbuffer())
-                st.info(f"File **{uploaded_file.name}** uploaded successfully!")
-                temp_paths.append(tmp_file.name)
-        except (IOError, OSError) as e:
-            st.error(f"Failed to save uploaded file {uploaded_file.name}: {e}")
-    return temp_paths
+        buffer = uploaded_file.getbuffer()
+        digest: str = hashlib.blake2b(buffer, digest_size=16).hexdigest()
+        temp_path: Optional[str] = saved_paths.get(digest)
+        if temp_path is None or not os.path.exists(temp_path):
+            try:
+                with tempfile.NamedTemporaryFile(
+                    delete=False, suffix=".zip"
+                ) as tmp_file:
+                    tmp_file.write(buffer)
+            except (IOError, OSError) as e:
+                st.error(f"Failed to save uploaded file {uploaded_file.name}: {e}")
+                continue
+            temp_path = saved_paths[digest] = tmp_file.name
+        st.info(f"File **{uploaded_file.name}** uploaded successfully!")
+        uploads.append((temp_path, digest))
+    return uploads
+
+
+def _read_and_format(
+    member: Tuple[str, ZipInfo, Optional[str]],
+    reader: ZipReader,
+    write: BoundFormatter,
+    file_metadata: Optional[Dict[str, Any]],
+) -> Tuple[str, List[str], Optional[str]]:
+    """Read, decode and format a single ZIP member on a worker thread.
+
+    No Streamlit calls are made here, since Streamlit elements can only be
+    created from the script thread; warnings are returned to the caller instead.
+
+    Args:
+        member (Tuple[str, ZipInfo, Optional[str]]): Relative path, ZipInfo and
+            skip message of the member, as yielded by ``ZipReader.members``.
+        reader (ZipReader): Reader for the ZIP file, shared by all worker threads.
+        write (BoundFormatter): Per-file formatter from ``make_formatter``.
+        file_metadata (Optional[Dict[str, Any]]): Metadata to include for the file,
+            with the size filled in per file, or None to omit metadata.
+
+    Returns:
+        Tuple[str, List[str], Optional[str]]: A tuple containing:
+            - The relative file path.
+            - The formatted prompt chunks for the file.
+            - A warning message if the file was skipped, otherwise None.
+
+    Raises:
+        FileProcessingError: If the member can't be read from the archive.
+        FormatError: If the file content can't be formatted.
+    """
+    rel_path, info, skip = member
+    if skip is not None:
+        return rel_path, [], skip
+    content: Optional[str] = reader.read_text(info)
+    if content is None:
+        return rel_path, [], f"Skipping binary file: {rel_path}"
+
+    if file_metadata is not None:
+        file_metadata = {**file_metadata, "size": info.file_size}
+
+    chunks: List[str] = ["\n"]
+    try:
+        write(chunks, rel_path, content, file_metadata)
+    except Exception as e:
+        raise FormatError(f"Failed to format {rel_path}: {e}") from e
+    return rel_path, chunks, None
+
+
+@st.cache_resource
+def _get_executor() -> ThreadPoolExecutor:
+    """Return the thread pool shared by every run, so reruns reuse its threads."""
+    return ThreadPoolExecutor(
+        max_workers=_READ_WORKERS, thread_name_prefix="code2prompt-read"
+    )
+
+
+def _map_in_order(
+    executor: ThreadPoolExecutor,
+    func: Callable[[T], R],
+    items: Iterable[T],
+    max_pending: int = _MAX_PENDING,
+) -> Iterator[R]:
+    """Map ``func`` over ``items`` on an executor, yielding results in order.
+
+    Unlike ``Executor.map``, items are pulled from the iterable lazily and at most
+    ``max_pending`` tasks are in flight, so a generator producing the items keeps
+    running alongside the workers instead of being drained up front. If a task
+    fails or the caller stops early, queued tasks are cancelled and running ones
+    are waited for, since the executor may be shared and outlive the call.
+    """
+    pending: Deque[Future] = deque()
+    try:
+        for item in items:
+            pending.append(executor.submit(func, item))
+            if len(pending) >= max_pending:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+        wait(pending)
 
 
 def process_files(
-    file_paths: List[str], temp_dir: str, output_format: str, options: Dict[str, Any]
+    reader: ZipReader,
+    members: Iterable[Tuple[str, ZipInfo, Optional[str]]],
+    output_format: str,
+    options: Dict[str, Any],
 ) -> Tuple[List[str], List[str]]:
     """Process individual files and format their content.
 
+    The formatting options are validated once for the whole batch. Members are
+    then read, decompressed and formatted on a thread pool, so decompression of
+    different members runs in parallel; results are collected in input order,
+    keeping the prompt deterministic.
+
     Args:
-        file_paths (List[str]): List of file paths to process.
-        temp_dir (str): Temporary directory containing the files.
+        reader (ZipReader): Reader for the ZIP file containing the members.
+        members (Iterable[Tuple[str, ZipInfo, Optional[str]]]): Relative paths,
+            ZipInfos and skip messages of the members to process, as yielded by
+            ``ZipReader.members``.
         output_format (str): Desired output format ('Plaintext', 'Markdown', 'XML', 'JSON').
         options (Dict[str, Any]): Formatting options to pass to formatter.
 
     Returns:
         Tuple[List[str], List[str]]: A tuple containing:
-            - A list of formatted prompt lines.
+            - A list of prompt chunks, to be combined with ``"".join``.
             - A file tree as a list of relative file paths.
+
+    Raises:
+        FileProcessingError: If a member can't be read from the archive.
+        FormatError: If the output format is unsupported or formatting fails.
     """
-    prompt_lines: List[str] = [
+    prompt_chunks: List[str] = [
         "Below is the structured project codebase extracted from the provided ZIP file:\n"
     ]
     file_tree: List[str] = []
-    for file_path in file_paths:
-        try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                content = f.read()
-        except UnicodeDecodeError:
-            st.warning(f"Skipping binary file: {file_path}")
-            continue
-        except IOError as e:
-            st.warning(f"Could not read file {file_path}: {e}")
+    skipped: List[str] = []
+    worker = partial(
+        _read_and_format,
+        reader=reader,
+        write=make_formatter(
+            output_format,
+            options.get("include_boundaries", True),
+            options.get("truncate_length", 0),
+        ),
+        file_metadata=options.get("file_metadata"),
+    )
+    for rel_path, chunks, warning in _map_in_order(_get_executor(), worker, members):
+        if warning is not None:
+            skipped.append(warning)
             continue
-
-        rel_path: str = os.path.relpath(file_path, temp_dir)
         file_tree.append(rel_path)
-        try:
-            formatted: str = format_file_content(
-                rel_path, content, output_format, options
-            )
-            prompt_lines.append(formatted)
-        except Exception as e:
-            raise FormatError(f"Failed to format {rel_path}: {e}") from e
-    return prompt_lines, file_tree
+        prompt_chunks.extend(chunks)
+
+    # One element for all skipped files instead of a warning per file.
+    if skipped:
+        with st.expander(f"⚠️ {len(skipped)} file(s) skipped"):
+            st.text("\n".join(skipped))
+    return prompt_chunks, file_tree
 
 
-@st.cache_data(show_spinner=False)
+@st.cache_resource(show_spinner=False, max_entries=8)
 def process_zip_file(
-    temp_zip_path: str,
-    ignore_options: Set[str],
+    _temp_zip_path: str,
+    zip_digest: str,
+    ignore_options: FrozenSet[str],
     output_format: str,
     options: Dict[str, Any],
-    file_types: Set[str],
-) -> Tuple[str, List[str]]:
-    """Process a ZIP file and generate the formatted prompt text and file tree preview.
+    file_types: FrozenSet[str],
+) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    """Process a ZIP file and generate the formatted prompt chunks and file tree preview.
+
+    Members are read straight from the archive, so nothing is extracted to disk.
+    Every upload is saved under a new temporary path, so the path is left out
+    of the cache key (Streamlit skips parameters starting with an underscore)
+    and the archive's content digest is used instead. Processing the same ZIP
+    again with the same settings is then served from the cache.
+
+    The result is cached with ``st.cache_resource`` rather than ``cache_data``,
+    so a hit returns the cached objects instead of unpickling a copy of a
+    possibly multi-megabyte prompt. Both parts of the result are immutable,
+    which makes sharing them safe, and at most eight results are kept. The
+    prompt is returned as chunks so that ``main`` can join the chunks of every
+    uploaded ZIP in one pass.
 
     Args:
-        temp_zip_path (str): Path to the temporary ZIP file.
-        ignore_options (Set[str]): Directories/files to ignore.
+        _temp_zip_path (str): Path to the temporary ZIP file.
+        zip_digest (str): Content digest of the ZIP file.
+        ignore_options (FrozenSet[str]): Directories/files to ignore.
         output_format (str): Desired output format.
         options (Dict[str, Any]): Additional formatting options.
-        file_types (Set[str]): Allowed file types.
+        file_types (FrozenSet[str]): Allowed file types.
 
     Returns:
-        Tuple[str, List[str]]: A tuple containing:
-            - Combined prompt text.
-            - File tree as a list of relative file paths.
+        Tuple[Tuple[str, ...], Tuple[str, ...]]: A tuple containing:
+            - Prompt chunks, to be combined with ``"".join``.
+            - File tree as a tuple of relative file paths.
 
     Raises:
         FileProcessingError: If there's an error with the ZIP file.
-        TempFileError: If there's an error with temporary file handling.
+        FormatError: If the output format is unsupported or formatting fails.
     """
-    try:
-        temp_dir: str = extract_zip(temp_zip_path)
-    except zipfile.BadZipFile as e:
-        raise FileProcessingError(f"Invalid or corrupted ZIP file: {e}") from e
-    except OSError as e:
-        raise TempFileError(
-            f"Failed to create or access temporary directory: {e}"
-        ) from e
-
-    try:
-        file_paths: List[str] = get_files_from_directory(
-            temp_dir, ignore_options, file_types
-        )
-        prompt_lines, file_tree = process_files(
-            file_paths, temp_dir, output_format, options
+    with ZipReader(_temp_zip_path) as reader:
+        prompt_chunks, file_tree = process_files(
+            reader,
+            reader.members(ignore_options, file_types),
+            output_format,
+            options,
         )
-    finally:
-        try:
-            shutil.rmtree(temp_dir, ignore_errors=True)
-        except OSError as e:
-            st.warning(f"Failed to clean up temporary directory {temp_dir}: {e}")
-
-    return "\n".join(prompt_lines), file_tree
+    return tuple(prompt_chunks), tuple(file_tree)
 
 
 def _process_single_zip(
-    temp_zip_path: str,
-    processing_args: Tuple[Set[str], str, Dict[str, Any], Set[str]],
+    upload: Tuple[str, str],
+    processing_args: Tuple[FrozenSet[str], str, Dict[str, Any], FrozenSet[str]],
     progress_info: Tuple[int, int],
-) -> Tuple[str, List[str], List[str]]:
+) -> Tuple[Tuple[str, ...], Tuple[str, ...], List[str]]:
     """Process a single ZIP file and return its results.
 
     Args:
-        temp_zip_path (str): Path to the ZIP file.
+        upload (Tuple[str, str]): Path and content digest of the ZIP file.
         processing_args: Tuple containing
             - ignore_options
             - output_format
@@ -171,26 +309,28 @@ def _process_single_zip(
         progress_info: Tuple containing (current_index, total_files).
 
     Returns:
-        Tuple containing (prompt_text, file_tree, log_messages) for this ZIP file.
+        Tuple containing (prompt_chunks, file_tree, log_messages) for this ZIP file.
     """
+    temp_zip_path, zip_digest = upload
     idx, total = progress_info
     ignore_options, output_format, format_options, file_types = processing_args
     log_messages: List[str] = []
 
     try:
         with st.spinner(f"Processing file {idx+1} of {total}..."):
-            prompt_text, file_tree = process_zip_file(
+            prompt_chunks, file_tree = process_zip_file(
                 temp_zip_path,
+                zip_digest,
                 ignore_options,
                 output_format,
                 format_options,
                 file_types,
             )
         log_messages.append(f"Processed {Path(temp_zip_path).name} successfully.")
-        return prompt_text, file_tree, log_messages
+        return prompt_chunks, file_tree, log_messages
     except (FileProcessingError, FormatError, TempFileError, OSError) as e:
         log_messages.append(f"Error processing {Path(temp_zip_path).name}: {e}")
-        return "", [], log_messages
+        return (), (), log_messages
     finally:
         try:
             Path(temp_zip_path).unlink(missing_ok=True)
@@ -199,51 +339,66 @@ def _process_single_zip(
 
 
 def process_uploads(
-    temp_zip_paths: List[str],
-    ignore_options: Set[str],
+    uploads: List[Tuple[str, str]],
+    ignore_options: FrozenSet[str],
     output_format: str,
     format_options: Dict[str, Any],
-    file_types: Set[str],
-) -> Tuple[str, List[str], List[str]]:
-    """Process multiple uploaded ZIP files and generate combined prompt text.
+    file_types: FrozenSet[str],
+) -> Tuple[List[str], List[str], List[str]]:
+    """Process multiple uploaded ZIP files and generate combined prompt chunks.
+
+    The prompts of the individual ZIP files are not joined here; their chunks
+    are collected into one list, separated by blank lines, so the caller can
+    build the final prompt with a single ``"".join``.
 
     Args:
-        temp_zip_paths (List[str]): List of temporary ZIP file paths.
-        ignore_options (Set[str]): Directories/files to ignore.
+        uploads (List[Tuple[str, str]]): Temporary ZIP file paths and content
+            digests, as returned by ``handle_file_upload``.
+        ignore_options (FrozenSet[str]): Directories/files to ignore.
         output_format (str): Desired output format.
         format_options (Dict[str, Any]): Formatting options.
-        file_types (Set[str]): Allowed file types.
+        file_types (FrozenSet[str]): Allowed file types.
 
     Returns:
-        Tuple[str, List[str], List[str]]: A tuple containing:
-            - Combined prompt text from all processed ZIP files.
+        Tuple[List[str], List[str], List[str]]: A tuple containing:
+            - Combined prompt chunks from all processed ZIP files.
             - Combined file tree as a list of relative file paths.
             - Log messages from processing steps.
     """
     processing_args = (ignore_options, output_format, format_options, file_types)
-    results: List[Tuple[str, List[str], List[str]]] = []
+    prompt_chunks: List[str] = []
+    file_tree: List[str] = []
+    log_messages: List[str] = []
     progress_bar = st.progress(0)
-    total_files = len(temp_zip_paths)
+    total_files = len(uploads)
 
-    for idx, path in enumerate(temp_zip_paths):
-        result = _process_single_zip(path, processing_args, (idx + 1, total_files))
-        results.append(result)
+    # Combine the results as each ZIP file finishes, in a single pass.
+    for idx, upload in enumerate(uploads):
+        zip_chunks, zip_tree, zip_logs = _process_single_zip(
+            upload, processing_args, (idx + 1, total_files)
+        )
+        if zip_chunks:
+            if prompt_chunks:
+                prompt_chunks.append("\n\n")
+            prompt_chunks.extend(zip_chunks)
+        file_tree.extend(zip_tree)
+        log_messages.extend(zip_logs)
         progress_bar.progress((idx + 1) / total_files)
 
-    # Combine results
-    all_prompts, all_trees, all_logs = zip(*results) if results else ([], [], [])
-    return (
-        "\n\n".join(filter(None, all_prompts)),
-        [item for sublist in all_trees for item in sublist],
-        [item for sublist in all_logs for item in sublist],
-    )
+    return prompt_chunks, file_tree, log_messages
 
 
-def setup_sidebar_options() -> Tuple[Set[str], str, Dict[str, Any], Set[str]]:
+def setup_sidebar_options() -> (
+    Tuple[FrozenSet[str], str, Dict[str, Any], FrozenSet[str]]
+):
     """Set up and retrieve sidebar options for the app.
 
+    The ignore and file type selections are returned as frozensets: they are
+    hashed for every cached ``process_zip_file`` lookup and probed for every
+    scanned member, and ZipReader.members reuses a frozenset without copying it.
+
     Returns:
-        Tuple[Set[str], str, Dict[str, Any], Set[str]]:
+        Tuple[FrozenSet[str], str, Dict[str, Any], FrozenSet[str]]:
             - ignore_options: Directories/files to ignore.
             - output_format: Selected output format.
             - format_options: Formatting options.
@@ -256,9 +411,13 @@ def setup_sidebar_options() -> Tuple[Set[str], str, Dict[str, Any], Set[str]]:
     ignore_options: Set[str] = set(
         st.sidebar.multiselect(
             "Select directories/files to ignore:",
-            options=DEFAULT_IGNORE_DIRS,
-            default=DEFAULT_IGNORE_DIRS,
-            help="Common directories to exclude (e.g., node_modules, .git).",
+            options=DEFAULT_IGNORE_DIRS + DEFAULT_SKIP_FILES,
+            default=DEFAULT_IGNORE_DIRS + DEFAULT_SKIP_FILES,
+            help=(
+                "Common directories to exclude (e.g., node_modules, .git) and "
+                "generated files such as lockfiles and minified bundles. File "
+                "names may use glob patterns (e.g., *.min.js)."
+            ),
         )
     )
     custom_ignore: str = st.sidebar.text_input(
@@ -312,9 +471,9 @@ def setup_sidebar_options() -> Tuple[Set[str], str, Dict[str, Any], Set[str]]:
         default=DEFAULT_FILE_TYPES,
         help="Select the file types you want to process.",
     )
-    file_types: Set[str] = {ft.lower() for ft in file_types_selected}
+    file_types: FrozenSet[str] = frozenset(ft.lower() for ft in file_types_selected)
 
-    return ignore_options, output_format, format_options, file_types
+    return frozenset(ignore_options), output_format, format_options, file_types
 
 
 def main() -> None:
@@ -337,15 +496,15 @@ def main() -> None:
     generate_button: bool = st.sidebar.button("🔄 Generate Prompt")
 
     # Handle file uploads.
-    temp_zip_paths: List[str] = handle_file_upload(multi=True)
+    uploads: List[Tuple[str, str]] = handle_file_upload(multi=True)
     log_placeholder = st.empty()
 
-    if temp_zip_paths and generate_button:
-        combined_prompt: str
+    if uploads and generate_button:
+        prompt_chunks: List[str]
         combined_file_tree: List[str]
         log_messages: List[str]
-        combined_prompt, combined_file_tree, log_messages = process_uploads(
-            temp_zip_paths, ignore_options, output_format, format_options, file_types
+        prompt_chunks, combined_file_tree, log_messages = process_uploads(
+            uploads, ignore_options, output_format, format_options, file_types
         )
 
         custom_header: str = st.sidebar.text_input(
@@ -353,21 +512,37 @@ def main() -> None:
             value="",
             help="Optional custom header to include at the top of the generated prompt.",
         )
-        final_prompt: str = (
-            f"{custom_header.strip()}\n" if custom_header.strip() else ""
-        ) + combined_prompt
+        if custom_header.strip():
+            prompt_chunks.insert(0, f"{custom_header.strip()}\n")
+        # Join the chunks of every ZIP file in one pass.
+        final_prompt: str = "".join(prompt_chunks)
 
         st.session_state["prompt_text"] = final_prompt
         st.session_state["file_tree"] = combined_file_tree
 
         st.success("Prompt generated successfully!")
-        st.text_area("Generated Prompt", value=final_prompt, height=500)
+        if len(final_prompt) > _MAX_TEXT_AREA_CHARS:
+            # A multi-megabyte text area hangs the browser; offer the full
+            # prompt as a download and only preview its beginning.
+            st.download_button(
+                "📥 Download Prompt",
+                data=final_prompt,
+                file_name="prompt.txt",
+                mime="text/plain",
+            )
+            st.text_area(
+                f"Generated Prompt (first {_PREVIEW_CHARS:,} characters)",
+                value=final_prompt[:_PREVIEW_CHARS],
+                height=500,
+            )
+        else:
+            st.text_area("Generated Prompt", value=final_prompt, height=500)
         log_placeholder.text("\n".join(log_messages))
 
     if st.checkbox("Show file tree preview") and st.session_state.get("file_tree"):
         with st.expander("File Tree Preview"):
-            for rel_path in st.session_state["file_tree"]:
-                st.write(rel_path)
+            # One element for the whole tree instead of one per file.
+            st.code("\n".join(st.session_state["file_tree"]), language=None)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,24 @@
+"""Shared helpers for the Code2Prompt application.
+
+This module holds small utilities used by both the file processor and the
+formatter.
+"""
+
+
+def file_ext(name: str) -> str:
+    """Return the lowercased extension of a file name.
+
+    Equivalent to ``os.path.splitext(name)[1].lower()`` for bare file names
+    (leading dots don't start an extension), without splitext's generic path
+    handling or its tuple allocation.
+
+    Args:
+        name (str): The file name, without any directory components.
+
+    Returns:
+        str: The extension including its dot, or an empty string if there is none.
+    """
+    dot: int = name.rfind(".")
+    if dot <= 0 or (name[0] == "." and not name[:dot].lstrip(".")):
+        return ""
+    return name[dot:].lower()